@@ -6,34 +6,16 @@ Gemini Proxy Server for Continue
 
 import os
 import json
+import atexit
 import logging
+import threading
+from collections import OrderedDict
 from flask import Flask, request, jsonify, Response, stream_template
 from flask_cors import CORS
 from gemini_process import GeminiProcess
+from logging_setup import configure_once, log_file
 
-# 配置日志 - 写入到 console.log 文件
-log_dir = os.path.dirname(os.path.abspath(__file__))
-log_file = os.path.join(log_dir, 'console.log')
-
-# 创建日志格式
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-# 配置文件处理器
-file_handler = logging.FileHandler(log_file, encoding='utf-8')
-file_handler.setLevel(logging.INFO)
-file_handler.setFormatter(formatter)
-
-# 配置控制台处理器
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_handler.setFormatter(formatter)
-
-# 配置根日志器
-logging.basicConfig(
-    level=logging.INFO,
-    handlers=[file_handler, console_handler],
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_once()
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +26,8 @@ CORS(app)
 DEFAULT_PROVIDER = os.environ.get('GEMINI_PROVIDER', 'deepseek')
 DEFAULT_MODEL = os.environ.get('GEMINI_MODEL', 'deepseek-chat')
 DEFAULT_API_KEY = os.environ.get('GEMINI_API_KEY', None)
+# 后端类型：cli 使用 gemini-cli 子进程，http 直接通过连接池请求模型接口
+DEFAULT_BACKEND = os.environ.get('GEMINI_BACKEND', 'cli')
 
 # 环境变量默认值
 DEFAULT_OLLAMA_BASE_URL = os.environ.get('OLLAMA_BASE_URL', 'http://127.0.0.1:11434')
@@ -51,12 +35,87 @@ DEFAULT_LOCAL_BASE_URL = os.environ.get('LOCAL_BASE_URL', 'http://127.0.0.1:8080
 DEFAULT_DEEPSEEK_API_BASE = os.environ.get('DEEPSEEK_API_BASE', 'https://api.deepseek.com')
 DEFAULT_OPENAI_API_BASE = os.environ.get('OPENAI_API_BASE', 'https://api.openai.com')
 
-# 初始化 Gemini 进程
-gemini = GeminiProcess(
-    provider=DEFAULT_PROVIDER,
-    model=DEFAULT_MODEL,
-    api_key=DEFAULT_API_KEY
-)
+def create_backend(provider, model, api_key):
+    """按 GEMINI_BACKEND 创建后端实例"""
+    if DEFAULT_BACKEND == 'http':
+        # 仅在使用 HTTP 后端时才需要 httpx
+        from llm_client import LLMClient
+        return LLMClient(provider=provider, model=model, api_key=api_key)
+    return GeminiProcess(provider=provider, model=model, api_key=api_key)
+
+# SSE 帧的固定前后缀，每个 chunk 只需序列化字符串本身
+SSE_PREFIX = b'data: {"chunk": '
+SSE_SUFFIX = b'}\n\n'
+SSE_DONE = b'data: {"done": true}\n\n'
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no'
+}
+
+# 初始化 Gemini 后端
+gemini = create_backend(DEFAULT_PROVIDER, DEFAULT_MODEL, DEFAULT_API_KEY)
+
+# 按 (provider, model) 缓存已启动的后端实例，切换配置时复用而不是重启
+# 缓存按 LRU 淘汰，被淘汰的实例会终止其 gemini 子进程
+PROVIDER_CACHE_SIZE = 3
+_provider_cache = OrderedDict({(DEFAULT_PROVIDER, DEFAULT_MODEL): gemini})
+_provider_lock = threading.Lock()
+
+def _stop_cached_backends():
+    """退出时终止所有缓存的后端"""
+    with _provider_lock:
+        backends = list(_provider_cache.values())
+        _provider_cache.clear()
+    for backend in backends:
+        backend.stop()
+
+atexit.register(_stop_cached_backends)
+
+def switch_backend(provider=None, model=None, api_key=None):
+    """切换到 (provider, model) 对应的后端
+
+    锁内只决定缓存项，创建和终止后端这些耗时操作都在锁外进行，
+    避免阻塞其他配置请求。
+    """
+    global gemini
+    stale = []
+    try:
+        while True:
+            with _provider_lock:
+                key = (provider or gemini.provider, model or gemini.model)
+                # api_key 变化时丢弃所有仍在使用旧 key 的后端，切换回去时会用新 key 重建
+                if api_key:
+                    for cached_key in [k for k, b in _provider_cache.items() if b.api_key != api_key]:
+                        stale.append(_provider_cache.pop(cached_key))
+                backend = _provider_cache.get(key)
+                backend_api_key = api_key or gemini.api_key
+
+            created = backend is None
+            if created:
+                backend = create_backend(key[0], key[1], backend_api_key)
+
+            with _provider_lock:
+                cached = _provider_cache.get(key)
+                if not created and cached is not backend:
+                    # 锁外期间该后端已被其他请求移出缓存，重新选择
+                    continue
+                if created and cached is not None:
+                    if cached.api_key == backend.api_key:
+                        # 并发请求已经创建了同一个后端，沿用缓存中的实例
+                        stale.append(backend)
+                        backend = cached
+                    else:
+                        stale.append(_provider_cache.pop(key))
+                _provider_cache[key] = backend
+                _provider_cache.move_to_end(key)
+                while len(_provider_cache) > PROVIDER_CACHE_SIZE:
+                    stale.append(_provider_cache.popitem(last=False)[1])
+                gemini = backend
+                return backend
+    finally:
+        for old_backend in stale:
+            logger.info(f"Stopping cached backend: provider={old_backend.provider}, model={old_backend.model}")
+            old_backend.stop()
 
 @app.route('/ask', methods=['POST'])
 def ask():
@@ -99,16 +158,16 @@ def ask_stream():
             try:
                 # 使用流式发送
                 for chunk in gemini.send_prompt_stream(prompt):
-                    yield f"data: {json.dumps({'chunk': chunk})}\n\n"
+                    yield SSE_PREFIX + json.dumps(chunk, ensure_ascii=False).encode('utf-8') + SSE_SUFFIX
                 
                 # 发送完成信号
-                yield f"data: {json.dumps({'done': True})}\n\n"
+                yield SSE_DONE
                 
             except Exception as e:
                 logger.error(f"Error in streaming: {e}")
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+                yield f"data: {json.dumps({'error': str(e)})}\n\n".encode('utf-8')
         
-        return Response(generate(), mimetype='text/plain')
+        return Response(generate(), mimetype='text/event-stream', headers=SSE_HEADERS)
         
     except Exception as e:
         logger.error(f"Error processing streaming request: {e}")
@@ -120,7 +179,9 @@ def get_config():
     return jsonify({
         'provider': gemini.provider,
         'model': gemini.model,
+        'backend': DEFAULT_BACKEND,
         'environment_variables': {
+            'GEMINI_BACKEND': DEFAULT_BACKEND,
             'GEMINI_PROVIDER': os.environ.get('GEMINI_PROVIDER', DEFAULT_PROVIDER),
             'GEMINI_MODEL': os.environ.get('GEMINI_MODEL', DEFAULT_MODEL),
             'OLLAMA_BASE_URL': os.environ.get('OLLAMA_BASE_URL', DEFAULT_OLLAMA_BASE_URL),
@@ -147,8 +208,8 @@ def update_config():
         if api_key:
             os.environ['GEMINI_API_KEY'] = api_key
         
-        # 更新 Gemini 进程配置
-        gemini.update_config(provider, model, api_key)
+        # 切换到对应 (provider, model) 的后端
+        switch_backend(provider, model, api_key)
         
         return jsonify({
             'message': 'Configuration updated successfully',
@@ -196,9 +257,10 @@ def root():
 
 if __name__ == '__main__':
     logger.info(f"Starting gemini-proxy server v1.4.0 on port 5001")
-    logger.info(f"Default config: provider={DEFAULT_PROVIDER}, model={DEFAULT_MODEL}")
+    logger.info(f"Default config: provider={DEFAULT_PROVIDER}, model={DEFAULT_MODEL}, backend={DEFAULT_BACKEND}")
     logger.info("Features: multi-turn conversation, agent functionality, tool calls, streaming, configurable provider")
     logger.info("Supported providers: gemini, openai, ollama, local, deepseek")
     logger.info(f"Log file: {log_file}")
 
-    app.run(host='127.0.0.1', port=5001, debug=False)
+    # 每个请求一个线程，同一后端的 stdin 交互由 GeminiProcess.lock 串行化
+    app.run(host='127.0.0.1', port=5001, debug=False, threaded=True)
@@ -14,32 +14,15 @@ import threading
 import queue
 from typing import Generator
 
-# 配置日志 - 写入到 console.log 文件
-log_dir = os.path.dirname(os.path.abspath(__file__))
-log_file = os.path.join(log_dir, 'console.log')
-
-# 创建日志格式
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-# 配置文件处理器
-file_handler = logging.FileHandler(log_file, encoding='utf-8')
-file_handler.setLevel(logging.INFO)
-file_handler.setFormatter(formatter)
-
-# 配置控制台处理器
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_handler.setFormatter(formatter)
-
-# 配置根日志器
-logging.basicConfig(
-    level=logging.INFO,
-    handlers=[file_handler, console_handler],
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from logging_setup import configure_once
+
+configure_once()
 
 logger = logging.getLogger(__name__)
 
+# gemini 输出行的前缀，在模块加载时编译一次
+_OUTPUT_PREFIX_RE = re.compile(r'🤖 Output:\s?')
+
 class GeminiProcess:
     def __init__(self, provider: str = "deepseek", model: str = "deepseek-chat", api_key: str = None):
         self.provider = provider
@@ -47,8 +30,14 @@ class GeminiProcess:
         self.api_key = api_key
         self.process = None
         self.running = False
+        # stop() 之后实例不再可用，也不会再被重启
+        self.closed = False
         self.output_thread = None
         self.output_queue = queue.Queue()
+        # 启动时未等到输入提示符，它可能在第一次交互开始后才到达
+        self.skip_ready_banner = False
+        # 一次 prompt/响应交互或配置更新期间持有，保证同一时间只有一个请求使用 stdin
+        self.lock = threading.Lock()
         
         # 启动进程
         self.start_process()
@@ -93,8 +82,8 @@ class GeminiProcess:
             self.output_thread.daemon = True
             self.output_thread.start()
             
-            # 等待初始化
-            time.sleep(3)
+            # 等待 gemini 输出输入提示符，而不是固定等待
+            self.skip_ready_banner = not self._await_ready(timeout=5.0)
             logger.info(f"Started gemini process in interactive JSON mode with provider={self.provider}, model={self.model}")
             
         except Exception as e:
@@ -102,6 +91,23 @@ class GeminiProcess:
             self.process = None
             raise Exception(f"Failed to start gemini process: {e}")
 
+    def _await_ready(self, timeout: float = 5.0) -> bool:
+        """消费启动输出直到出现输入提示符，超时后记录警告并继续"""
+        deadline = time.time() + timeout
+        while self.is_process_alive():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                line = self.output_queue.get(timeout=min(remaining, 0.5))
+            except queue.Empty:
+                continue
+            if line.strip() == '👤 Input:':
+                return True
+
+        logger.warning(f"Gemini process did not report ready within {timeout}s, continuing anyway")
+        return False
+
     def _monitor_output(self):
         """监听进程输出的线程"""
         while self.running and self.process:
@@ -109,12 +115,12 @@ class GeminiProcess:
                 line = self.process.stdout.readline()
                 if not line:
                     break
-                    
-                if line:
-                    # 过滤掉初始化和调试信息
-                    if not line.startswith('Data collection is disabled'):
-                        self.output_queue.put(line)
-                        logger.debug(f"Output: {line}")
+
+                # 过滤掉初始化和调试信息
+                if not line.startswith('Data collection is disabled'):
+                    self.output_queue.put(line)
+                    # 每行都会调用，使用惰性格式化避免在 INFO 级别下的字符串拼接
+                    logger.debug("Output: %s", line)
             except Exception as e:
                 logger.error(f"Output monitoring error: {e}")
                 break
@@ -126,46 +132,60 @@ class GeminiProcess:
 
     def send_prompt_stream(self, prompt: str) -> Generator[str, None, None]:
         """流式发送 prompt 并返回生成器（模拟流式输出）"""
-        if not self.is_process_alive():
-            logger.warning("Gemini process is not alive, restarting...")
-            self.restart()
+        # gemini 进程只有一个 stdin，并发请求必须串行，否则输入和输出会交错
+        with self.lock:
+            if self.closed:
+                raise Exception("Gemini backend has been stopped.")
             if not self.is_process_alive():
-                raise Exception("Gemini process could not be restarted.")
+                logger.warning("Gemini process is not alive, restarting...")
+                self.restart()
+                if not self.is_process_alive():
+                    raise Exception("Gemini process could not be restarted.")
         
-        try:
-            logger.info(f"Sending prompt to gemini ({self.provider}/{self.model}): {prompt[:50]}...")
+            try:
+                logger.info(f"Sending prompt to gemini ({self.provider}/{self.model}): {prompt[:50]}...")
             
-            # 发送 prompt
-            self.process.stdin.write(prompt + '\n')
-            self.process.stdin.flush()
+                # 发送 prompt
+                self.process.stdin.write(prompt + '\n')
+                self.process.stdin.flush()
             
-            # 等待完整响应
-            response_content = ""
-            start_time = time.time()
-            timeout = 120  # 2分钟超时
+                # 等待完整响应
+                response_content = ""
+                start_time = time.time()
+                timeout = 120  # 2分钟超时
             
-            while time.time() - start_time < timeout:
-              # 非阻塞方式获取输出
-              try:
-                  line = self.output_queue.get_nowait()
-                  line = re.sub(r'🤖 Output:s?', '', line)
+                while time.time() - start_time < timeout:
+                  # 阻塞等待输出，有新行时立即唤醒
+                  remaining = timeout - (time.time() - start_time)
+                  try:
+                      line = self.output_queue.get(timeout=max(0, min(remaining, 1.0)))
+                  except queue.Empty:
+                      # 进程已被终止（例如被缓存淘汰）时不再等待
+                      if not self.is_process_alive():
+                          yield "Error: gemini process stopped before the response completed."
+                          return
+                      continue
+                  line = _OUTPUT_PREFIX_RE.sub('', line, count=1)
                   if not line.strip():
                       continue
                   elif line.strip() == '👤 Input:':
+                      if self.skip_ready_banner and not response_content:
+                          # 启动时迟到的提示符，不是本次响应的结束标志
+                          self.skip_ready_banner = False
+                          continue
+                      self.skip_ready_banner = False
                       return
+                  self.skip_ready_banner = False
                   response_content += line
                   yield line
-              except queue.Empty:
-                  time.sleep(0.1)
-                  continue
             
-            # 超时处理
-            if not response_content:
-                yield "Sorry, the response timed out. Please try again."
+                # 超时处理
+                if not response_content:
+                    yield "Sorry, the response timed out. Please try again."
                 
-        except Exception as e:
-            logger.error(f"Error in send_prompt_stream: {e}")
-            yield f"Error: {str(e)}"
+            except Exception as e:
+                logger.error(f"Error in send_prompt_stream: {e}")
+                yield f"Error: {str(e)}"
 
     def send_prompt(self, prompt: str) -> str:
         """发送 prompt 并返回完整响应"""
@@ -174,28 +194,45 @@ class GeminiProcess:
             response_parts.append(chunk)
         return ''.join(response_parts)
 
-    def restart(self):
-        """重启进程"""
-        logger.info("Restarting gemini process...")
+    def _terminate_process(self):
+        """终止当前子进程"""
         self.running = False
-        if self.process:
+        process = self.process
+        if process:
             try:
-                self.process.terminate()
-                self.process.wait(timeout=5)
+                process.terminate()
+                process.wait(timeout=5)
             except:
-                self.process.kill()
-        
+                process.kill()
+
+    def stop(self):
+        """终止进程并关闭实例，之后不会再重启"""
+        self.closed = True
+        # 先终止子进程，让正在进行的交互尽快结束并释放锁
+        self._terminate_process()
+        with self.lock:
+            # 持锁后再终止一次，处理交互期间刚被重启出来的子进程
+            self._terminate_process()
+            self.process = None
+
+    def restart(self):
+        """重启进程，调用方需持有 self.lock"""
+        logger.info("Restarting gemini process...")
+        self._terminate_process()
         self.process = None
         self.start_process()
 
     def update_config(self, provider: str = None, model: str = None, api_key: str = None):
         """更新配置并重启进程"""
-        if provider:
-            self.provider = provider
-        if model:
-            self.model = model
-        if api_key:
-            self.api_key = api_key
-        
-        logger.info(f"Updating config: provider={self.provider}, model={self.model}")
-        self.restart()
+        with self.lock:
+            if self.closed:
+                raise Exception("Gemini backend has been stopped.")
+            if provider:
+                self.provider = provider
+            if model:
+                self.model = model
+            if api_key:
+                self.api_key = api_key
+            
+            logger.info(f"Updating config: provider={self.provider}, model={self.model}")
+            self.restart()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+LLM HTTP Client
+通过连接池直接访问 OpenAI 兼容的 chat/completions 接口，替代 gemini-cli 子进程
+"""
+
+import os
+import json
+import atexit
+import logging
+import threading
+from typing import Generator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 进程内共享的 HTTP 客户端，所有请求复用同一个连接池，避免每次请求重新握手 TCP + TLS
+HTTP = httpx.Client(
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    timeout=httpx.Timeout(120.0)
+)
+atexit.register(HTTP.close)
+
+# 每次请求最多带上最近的多少轮对话（一问一答为一轮），避免上下文无限增长
+MAX_HISTORY_TURNS = 10
+
+# provider -> (基础地址环境变量, 默认基础地址, 是否需要 /v1 前缀)
+PROVIDER_ENDPOINTS = {
+    'deepseek': ('DEEPSEEK_API_BASE', 'https://api.deepseek.com', False),
+    'openai': ('OPENAI_API_BASE', 'https://api.openai.com', True),
+    'ollama': ('OLLAMA_BASE_URL', 'http://127.0.0.1:11434', True),
+    'local': ('LOCAL_BASE_URL', 'http://127.0.0.1:8080', True),
+}
+
+
+def chat_completions_url(provider: str) -> str:
+    """根据 provider 和环境变量拼出 chat/completions 地址"""
+    if provider not in PROVIDER_ENDPOINTS:
+        raise ValueError(f"Provider '{provider}' is not supported by the HTTP backend")
+
+    env_name, default_base, needs_v1 = PROVIDER_ENDPOINTS[provider]
+    base = os.environ.get(env_name, default_base).rstrip('/')
+    if needs_v1 and not base.endswith('/v1'):
+        base += '/v1'
+    return base + '/chat/completions'
+
+
+class LLMClient:
+    """与 GeminiProcess 接口一致的 HTTP 后端"""
+
+    def __init__(self, provider: str = "deepseek", model: str = "deepseek-chat", api_key: str = None):
+        self.provider = provider
+        self.model = model
+        self.api_key = api_key
+        self.messages = []
+        self.lock = threading.Lock()
+        # stop() 之后实例不再可用
+        self.closed = False
+
+        # 提前校验 provider，不支持时在启动阶段报错
+        chat_completions_url(self.provider)
+        logger.info(f"Using HTTP backend with provider={self.provider}, model={self.model}")
+
+    def is_process_alive(self):
+        # 没有子进程，连接由连接池按需建立
+        return True
+
+    def _headers(self):
+        headers = {'Content-Type': 'application/json'}
+        api_key = self.api_key or os.environ.get('GEMINI_API_KEY')
+        if api_key:
+            headers['Authorization'] = f'Bearer {api_key}'
+        return headers
+
+    def send_prompt_stream(self, prompt: str) -> Generator[str, None, None]:
+        """流式发送 prompt，逐个返回模型输出的增量内容"""
+        if self.closed:
+            raise Exception("HTTP backend has been stopped.")
+        with self.lock:
+            messages = self.messages + [{'role': 'user', 'content': prompt}]
+
+        payload = {
+            'model': self.model,
+            'messages': messages,
+            'stream': True
+        }
+
+        try:
+            logger.info(f"Sending prompt to {self.provider}/{self.model}: {prompt[:50]}...")
+
+            response_parts = []
+            with HTTP.stream('POST', chat_completions_url(self.provider), json=payload, headers=self._headers()) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line.startswith('data:'):
+                        continue
+                    data = line[5:].strip()
+                    if data == '[DONE]':
+                        break
+
+                    choices = json.loads(data).get('choices') or [{}]
+                    delta = choices[0].get('delta', {}).get('content')
+                    if delta:
+                        response_parts.append(delta)
+                        yield delta
+
+            # 保存多轮对话上下文
+            with self.lock:
+                self.messages.append({'role': 'user', 'content': prompt})
+                self.messages.append({'role': 'assistant', 'content': ''.join(response_parts)})
+                del self.messages[:-MAX_HISTORY_TURNS * 2]
+
+        except Exception as e:
+            logger.error(f"Error in send_prompt_stream: {e}")
+            # 上下文超出模型限制时通常返回 400，清空历史让后续请求可以继续
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 400 and len(messages) > 1:
+                logger.warning("Request rejected with history attached, resetting conversation")
+                with self.lock:
+                    self.messages = []
+            yield f"Error: {str(e)}"
+
+    def send_prompt(self, prompt: str) -> str:
+        """发送 prompt 并返回完整响应"""
+        return ''.join(self.send_prompt_stream(prompt))
+
+    def stop(self):
+        # 连接池由所有实例共享，在进程退出时统一关闭
+        self.closed = True
+
+    def restart(self):
+        """清空对话上下文"""
+        logger.info("Resetting HTTP backend conversation...")
+        with self.lock:
+            self.messages = []
+
+    def update_config(self, provider: str = None, model: str = None, api_key: str = None):
+        """更新配置，连接池保持不变"""
+        if provider:
+            chat_completions_url(provider)
+            self.provider = provider
+        if model:
+            self.model = model
+        if api_key:
+            self.api_key = api_key
+
+        logger.info(f"Updating config: provider={self.provider}, model={self.model}")
+        self.restart()
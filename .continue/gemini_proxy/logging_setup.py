@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Logging Setup
+gemini-proxy 共享的日志配置，写入 console.log 文件并输出到控制台
+"""
+
+import os
+import queue
+import atexit
+import logging
+import logging.handlers
+
+# 配置日志 - 写入到 console.log 文件
+log_dir = os.path.dirname(os.path.abspath(__file__))
+log_file = os.path.join(log_dir, 'console.log')
+
+_configured = False
+
+
+def configure_once():
+    """配置根日志器，多个模块导入时只生效一次"""
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    # 创建日志格式
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    # 配置文件处理器
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(formatter)
+
+    # 配置控制台处理器
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
+
+    # 请求线程只把日志记录放入队列，由后台线程负责写磁盘和控制台
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    # 队列处理器只保留原始消息，完整格式由上面的处理器生成
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
+    # 配置根日志器
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
@@ -38,6 +38,35 @@ def cleanup_soffice_process():
 atexit.register(cleanup_soffice_process)
 
 
+def _make_col_labels(count):
+    """Builds the column labels A, B, ..., Z, AA, ... for the first `count` columns."""
+    letters = [chr(ord('A') + i) for i in range(26)]
+    labels = list(letters)
+    width = letters
+    while len(labels) < count:
+        width = [prefix + letter for prefix in width for letter in letters]
+        labels.extend(width)
+    return labels[:count]
+
+
+# Calc supports up to 16384 columns (A..XFD); index 0 is column A.
+_COL_LABELS = _make_col_labels(16384)
+_COL_INDEX = {label: index for index, label in enumerate(_COL_LABELS)}
+
+
+def cell_position(cell_addr):
+    """Turns a "$Sheet1.$A$1"-style name back into a zero-based (column, row) pair."""
+    _, col, row = cell_addr.rsplit('.', 1)[1].split('$')
+    return _COL_INDEX[col], int(row) - 1
+
+
+def format_value(value):
+    """Renders a getDataArray value as text, keeping whole numbers free of a trailing '.0'."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
 class SheetModifyListener(XModifyListener, XEventListener):
     """
     A listener that gets notified of sheet modifications.
@@ -64,6 +93,8 @@ class RealTimeMonitor:
         self.document = None
         self.listeners = []
         self.sheet_states = {}
+        # Displayed text of cells seen changing, keyed by sheet then address
+        self.cell_texts = {}
 
     def start_libreoffice(self):
         """Starts a headless LibreOffice instance listening for connections."""
@@ -127,11 +158,19 @@ class RealTimeMonitor:
         last_col = cursor.getRangeAddress().EndColumn
         last_row = cursor.getRangeAddress().EndRow
 
-        for r in range(last_row + 1):
-            for c in range(last_col + 1):
-                cell = sheet.getCellByPosition(c, r)
-                if cell.String: # Using .String gets the displayed text
-                    state[cell.AbsoluteName] = cell.String
+        # Fetch the whole used area in one UNO call instead of one per cell,
+        # and build the "$Sheet1.$A$1"-style names in Python.
+        data = sheet.getCellRangeByPosition(0, 0, last_col, last_row).getDataArray()
+        sheet_prefix = sheet.getCellByPosition(0, 0).AbsoluteName.rsplit('.', 1)[0]
+
+        for r, row in enumerate(data):
+            for c, value in enumerate(row):
+                if value is None:
+                    # Formula errors come back as void; fetch the displayed
+                    # error text (e.g. "#DIV/0!") for these rare cells only.
+                    value = sheet.getCellByPosition(c, r).String
+                if value != "":
+                    state[f"{sheet_prefix}.${_COL_LABELS[c]}${r + 1}"] = format_value(value)
         return state
 
     def compare_and_log(self, sheet_name):
@@ -141,11 +180,21 @@ class RealTimeMonitor:
         old_state = self.sheet_states.get(sheet_name, {})
         
         base_name = os.path.basename(self.file_path)
-        all_cells = set(old_state.keys()) | set(new_state.keys())
+        # The symmetric difference of the item views keeps only the
+        # (address, value) pairs that differ, so unchanged cells are never
+        # visited in Python.
+        changed_cells = {cell_addr for cell_addr, _ in old_state.items() ^ new_state.items()}
+        texts = self.cell_texts.setdefault(sheet_name, {})
 
-        for cell_addr in sorted(list(all_cells)):
-            old_value = old_state.get(cell_addr)
-            new_value = new_state.get(cell_addr)
+        for cell_addr in sorted(changed_cells):
+            # Log what the user sees (formatted dates, rounded numbers, ...)
+            # rather than the raw values; only the changed cells are read.
+            old_value = texts.pop(cell_addr, old_state.get(cell_addr))
+            new_value = None
+            if cell_addr in new_state:
+                col, row = cell_position(cell_addr)
+                new_value = sheet.getCellByPosition(col, row).String
+                texts[cell_addr] = new_value
 
             if old_value != new_value:
                 if old_value is None:
@@ -21,6 +21,21 @@ logging.basicConfig(
 )
 
 
+def _make_col_labels(count):
+    """Builds the column labels A, B, ..., Z, AA, ... for the first `count` columns."""
+    letters = [chr(ord('A') + i) for i in range(26)]
+    labels = list(letters)
+    width = letters
+    while len(labels) < count:
+        width = [prefix + letter for prefix in width for letter in letters]
+        labels.extend(width)
+    return labels[:count]
+
+
+# WPS/Excel sheets have up to 16384 columns (A..XFD); index 0 is column A.
+_COL_LABELS = _make_col_labels(16384)
+
+
 class WpsEventHandler:
     """
     Handles events fired by the WPS Application.
@@ -81,34 +96,60 @@ class RealTimeMonitor:
         last_row = sheet.Cells(sheet.Rows.Count, 1).End(3).Row # 3 corresponds to xlUp in WPS
         last_col = sheet.Cells(1, sheet.Columns.Count).End(1).Column # 1 corresponds to xlToLeft in WPS
 
-        for r in range(1, last_row + 1):
-            for c in range(1, last_col + 1):
-                cell = sheet.Cells(r, c)
-                if cell.Value is not None:
-                    state[cell.Address] = str(cell.Value)
+        # Read the whole block with one COM call instead of one call per cell.
+        values = sheet.Range(sheet.Cells(1, 1), sheet.Cells(last_row, last_col)).Value
+        if not isinstance(values, tuple):
+            values = ((values,),) # A single-cell range returns a bare value
+
+        for r, row in enumerate(values, start=1):
+            for c, value in enumerate(row):
+                if value is not None:
+                    state[f"${_COL_LABELS[c]}${r}"] = str(value)
         return state
 
+    def log_change(self, sheet_name, cell_addr, old_value, new_value):
+        """Logs a single cell change between two different values."""
+        base_name = os.path.basename(self.file_path)
+        if old_value is None:
+            logging.info(f"[{base_name}][{sheet_name}] Event: Cell created {cell_addr} = '{new_value}'")
+        elif new_value is None:
+            logging.info(f"[{base_name}][{sheet_name}] Event: Cell deleted {cell_addr} (was '{old_value}')")
+        else:
+            logging.info(f"[{base_name}][{sheet_name}] Event: Cell updated {cell_addr} from '{old_value}' to '{new_value}'")
+
     def compare_and_log(self, sheet_name, target_range):
         """Compares the changed cells and logs the differences."""
+        old_state = self.sheet_states.setdefault(sheet_name, {})
         sheet = self.workbook.Sheets(sheet_name)
-        new_state = self.get_sheet_state(sheet) # Get the full new state
-        old_state = self.sheet_states.get(sheet_name, {})
-        base_name = os.path.basename(self.file_path)
 
+        # Inserting or deleting whole rows/columns shifts every cell past the
+        # changed band to a new address, so resync the full sheet state with
+        # one bulk read and diff it instead of walking the band cell by cell.
+        if (target_range.Rows.Count == sheet.Rows.Count
+                or target_range.Columns.Count == sheet.Columns.Count):
+            new_state = self.get_sheet_state(sheet)
+            changed_cells = {cell_addr for cell_addr, _ in old_state.items() ^ new_state.items()}
+            for cell_addr in sorted(changed_cells):
+                self.log_change(sheet_name, cell_addr, old_state.get(cell_addr), new_state.get(cell_addr))
+            self.sheet_states[sheet_name] = new_state
+            return
+
+        # For ordinary edits only the cells in target_range can have changed,
+        # so the stored state is updated in place instead of rescanning the
+        # whole sheet.
         for cell in target_range:
             cell_addr = cell.Address
+            value = cell.Value
             old_value = old_state.get(cell_addr)
-            new_value = str(cell.Value) if cell.Value is not None else None
+            new_value = str(value) if value is not None else None
 
             if old_value != new_value:
-                if old_value is None and new_value is not None:
-                    logging.info(f"[{base_name}][{sheet_name}] Event: Cell created {cell_addr} = '{new_value}'")
-                elif new_value is None and old_value is not None:
-                    logging.info(f"[{base_name}][{sheet_name}] Event: Cell deleted {cell_addr} (was '{old_value}')")
+                self.log_change(sheet_name, cell_addr, old_value, new_value)
+
+                if new_value is None:
+                    del old_state[cell_addr]
                 else:
-                    logging.info(f"[{base_name}][{sheet_name}] Event: Cell updated {cell_addr} from '{old_value}' to '{new_value}'")
-        
-        self.sheet_states[sheet_name] = new_state
+                    old_state[cell_addr] = new_value
 
     def run(self):
         """Main method to start monitoring."""